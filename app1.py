@@ -1,118 +1,24 @@
-import pickle, numpy as np, os, logging, json
-from fastapi import FastAPI, UploadFile, Form
-from fastapi.responses import JSONResponse
-from fastapi.middleware.cors import CORSMiddleware
-from deepface import DeepFace
-from io import BytesIO
-from PIL import Image
-
-# Google Sheets
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+"""Fast Face Attendance API with verified attendance appended to Google Sheets."""
+import os
+import logging
 
 # ---------------- Settings ----------------
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
 os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
 logging.getLogger("tensorflow").setLevel(logging.ERROR)
 
-app = FastAPI(title="Fast Face Attendance API")
+from server.app import create_app
+from server.config import load_config
 
 # CORS for frontend (update with your frontend URL)
 origins = ["https://sorry-no-proxy-frontend.onrender.com"]
-app.add_middleware(
-    CORSMiddleware, allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"]
-)
-
-# ---------------- Face Database ----------------
-DB_FILE = "face_fast_db.pkl"
-try:
-    with open(DB_FILE, "rb") as f:
-        face_db = pickle.load(f)
-except FileNotFoundError:
-    face_db = {}
-
-# ---------------- Load Facenet ----------------
-model = DeepFace.build_model("Facenet")
-
-# ---------------- Google Sheets ----------------
-SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
-
-# Load service account from ENV (Render)
-GOOGLE_PRIVATE_KEY = os.environ.get("GOOGLE_PRIVATE_KEY", "").replace("\\n", "\n")
-GOOGLE_CLIENT_EMAIL = os.environ.get("GOOGLE_SERVICE_ACCOUNT_EMAIL")
-SPREADSHEET_ID = os.environ.get("SHEET_ID")
-
-credentials_dict = {
-    "type": "service_account",
-    "private_key": GOOGLE_PRIVATE_KEY,
-    "client_email": GOOGLE_CLIENT_EMAIL,
-    "token_uri": "https://oauth2.googleapis.com/token"
-}
-credentials = service_account.Credentials.from_service_account_info(credentials_dict, scopes=SCOPES)
-sheets_service = build("sheets", "v4", credentials=credentials)
-
-def append_to_sheets(register_number, code):
-    sheets_service.spreadsheets().values().append(
-        spreadsheetId=SPREADSHEET_ID,
-        range="Sheet1!A:B",
-        valueInputOption="RAW",
-        body={"values": [[register_number, code]]}
-    ).execute()
-
-# ---------------- Face Recognition ----------------
-def recognize_face_bytes(image_bytes):
-    img = Image.open(BytesIO(image_bytes)).convert("RGB")
-    img_array = np.array(img)
-    try:
-        embedding = DeepFace.represent(
-            img_path=img_array, model_name="Facenet", model=model,
-            detector_backend="opencv", enforce_detection=False
-        )[0]["embedding"]
-    except Exception as e:
-        return "Unknown", 0.0
-
-    identity, min_dist = "Unknown", float("inf")
-    for reg, db_emb in face_db.items():
-        dist = np.linalg.norm(np.array(embedding) - np.array(db_emb))
-        if dist < min_dist:
-            min_dist, identity = dist, reg
-
-    threshold = 10
-    similarity = 1 / (1 + min_dist)
-    if min_dist > threshold:
-        identity = "Unknown"
-    return identity, similarity
-
-# ---------------- API ----------------
-@app.get("/")
-async def root():
-    return {"message": "✅ Face Attendance API running"}
-
-@app.post("/verify-attendance")
-async def verify_attendance(registerNumber: str = Form(...), file: UploadFile = None):
-    if not file:
-        return JSONResponse({"message": "❌ No image uploaded"}, status_code=400)
-
-    image_bytes = await file.read()
-    identity, similarity = recognize_face_bytes(image_bytes)
-    similarity_percent = round(similarity * 100, 2)
 
-    if identity == registerNumber:
-        attendance_code = f"CODE-{np.random.randint(1000,9999)}"
-        append_to_sheets(registerNumber, attendance_code)
-        return JSONResponse({
-            "message": f"✅ Attendance marked for {registerNumber} (Similarity: {similarity_percent}%)",
-            "code": attendance_code
-        })
-    else:
-        return JSONResponse({
-            "message": f"❌ Face does not match register number (Similarity: {similarity_percent}%)"
-        })
+# Google Sheets credentials are read from GOOGLE_PRIVATE_KEY,
+# GOOGLE_SERVICE_ACCOUNT_EMAIL and SHEET_ID (Render env)
+config = load_config("facenet", cors_origins=origins, sink="sheets")
+app = create_app(config)
 
 # ---------------- Run Server ----------------
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("app1:app", host="0.0.0.0", port=int(os.environ.get("PORT", 8000)))
+    uvicorn.run("app1:app", host=config.host, port=config.port)
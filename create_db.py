@@ -1,8 +1,9 @@
 # create_fast_db.py
-import pickle
 from deepface import DeepFace
 import os
 
+from server.gallery import write_gallery_file
+
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"  # suppress TensorFlow warnings
 
 # ================= Enrollment data =================
@@ -38,7 +39,7 @@ for enroll_no, img_path in enrollments:
         print(f"[!] Failed to register {enroll_no}: {e}")
 
 # ================= Save DB =================
-with open(DB_FILE, "wb") as f:
-    pickle.dump(face_db, f)
+# Record the model so the server refuses to mix it with other embeddings
+write_gallery_file(DB_FILE, MODEL_NAME, face_db)
 
 print("✅ Fast face database created successfully!")
@@ -1,8 +1,9 @@
 # register_faces.py
 import os
-import pickle
 from deepface import DeepFace
 
+from server.gallery import write_gallery_file
+
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 
 face_db = {}
@@ -23,7 +24,7 @@ for regno, img_path in students.items():
     except Exception as e:
         print(f"[!] Failed to register {regno}: {e}")
 
-with open("face_db.pkl", "wb") as f:
-    pickle.dump(face_db, f)
+# Facenet gallery used by the "facenet" server preset (app.py / app1.py)
+write_gallery_file("face_db.pkl", "Facenet", face_db)
 
 print("✅ All faces registered and pickle file created.")
@@ -0,0 +1,8 @@
+# server/__init__.py
+"""
+Face recognition attendance server.
+
+Model, detector, metric, gallery backend and attendance sink are selected by
+``server.config``; ``server.app.create_app`` builds the FastAPI app from a config.
+Run with ``python -m server`` (set FACEAPP_PRESET / FACEAPP_* to configure).
+"""
@@ -0,0 +1,10 @@
+# server/__main__.py
+import uvicorn
+
+from server.app import create_app
+from server.config import load_config
+
+if __name__ == "__main__":
+    config = load_config()
+    print(f"Starting {config.title} ({config.model_name} + {config.detector}, {config.metric})...")
+    uvicorn.run(create_app(config), host=config.host, port=config.port)
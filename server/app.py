@@ -0,0 +1,271 @@
+# server/app.py
+"""FastAPI application factory for the face recognition attendance API."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+
+import anyio
+import anyio.to_thread
+from fastapi import FastAPI, File, Form, HTTPException, Query, UploadFile
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
+
+from server.jobs import FINISHED_STATES, JobManager, JobStore, QueueFullError
+from server.service import AttendanceService
+
+# Upper bound for long-polling a job result
+MAX_JOB_WAIT_SECONDS = 60
+# How often a long-poll re-reads the job's status
+JOB_POLL_INTERVAL_SECONDS = 0.25
+
+
+def parse_time(value, field):
+    """Parse an ISO 8601 timestamp as naive local time, converting any UTC offset."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{field} must be an ISO 8601 timestamp")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+async def read_batch(registerNumbers, files):
+    if not registerNumbers:
+        raise HTTPException(status_code=400, detail="At least one enrollment number is required")
+    if len(registerNumbers) != len(files):
+        raise HTTPException(status_code=400, detail="Each enrollment number needs exactly one image")
+    return [(registerNumber, await file.read()) for registerNumber, file in zip(registerNumbers, files)]
+
+
+def create_app(config):
+    service = AttendanceService(config)
+    gallery = service.gallery
+
+    job_manager = JobManager(JobStore(config.jobs_db_file))
+    job_manager.register("register-students", service.run_register_batch)
+    job_manager.register("verify-batch", service.run_verify_batch)
+
+    app = FastAPI(title=config.title, version="1.0.0")
+    app.state.config = config
+    app.state.service = service
+    app.state.job_manager = job_manager
+    # Set at startup; until then inference falls back to the default threadpool
+    app.state.inference_limiter = None
+
+    # Enable CORS for the frontend
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=config.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    @app.on_event("startup")
+    def start_job_workers():
+        job_manager.start()
+
+    @app.on_event("startup")
+    async def create_inference_limiter():
+        # anyio limiters belong to the event loop they are created in
+        app.state.inference_limiter = anyio.CapacityLimiter(config.inference_threads)
+
+    @app.on_event("startup")
+    def start_model_warm_up():
+        # Serve /health (as "warming") while TensorFlow and the model load
+        if config.warm_up:
+            service.model_state = "warming"
+            threading.Thread(target=service.warm_up, name="model-warm-up", daemon=True).start()
+
+    @app.on_event("shutdown")
+    def stop_job_workers():
+        job_manager.stop()
+
+    async def run_inference(func, *args):
+        # Inference gets its own thread limit instead of sharing the default threadpool,
+        # so queued verifications cannot starve other blocking work such as gallery saves
+        return await anyio.to_thread.run_sync(func, *args, limiter=app.state.inference_limiter)
+
+    def get_session_or_404(session_id):
+        session = service.sessions.get(session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+        return session
+
+    def submit_job(kind, payload):
+        try:
+            job_id = job_manager.submit(kind, payload, total=len(payload))
+        except QueueFullError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        return job_manager.get(job_id)
+
+    # ================= API Endpoints =================
+    @app.get("/")
+    async def root():
+        return {"message": "Face Recognition Attendance API is running!"}
+
+    @app.get("/health")
+    async def health_check():
+        if service.model_state == "warming":
+            status = "warming"
+        elif service.model_state == "failed":
+            status = "degraded"
+        else:
+            status = "healthy"
+        return {
+            "status": status,
+            "model_state": service.model_state,
+            "registered_faces": len(gallery),
+            "model": config.model_name,
+            "detector": config.detector,
+            "metric": config.metric
+        }
+
+    @app.post("/verify-attendance")
+    async def verify_attendance(
+        registerNumber: str = Form(...),
+        file: UploadFile = File(...),
+        sessionId: Optional[str] = Form(None)
+    ):
+        """
+        Verify attendance by comparing uploaded face image with registered enrollment number
+        """
+        try:
+            # Validate enrollment number
+            if not registerNumber:
+                raise HTTPException(status_code=400, detail="Enrollment number is required")
+
+            session = get_session_or_404(sessionId) if sessionId else None
+
+            image_bytes = await file.read()
+            # Inference runs in a worker thread so the event loop keeps serving
+            # other requests (e.g. /health while the model is still importing)
+            return await run_inference(service.verify_face, registerNumber, image_bytes, session)
+
+        except HTTPException:
+            raise
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+    @app.get("/registered-students")
+    async def get_registered_students():
+        """Get list of all registered students"""
+        return {
+            "students": gallery.ids(),
+            "count": len(gallery)
+        }
+
+    @app.post("/register-student")
+    async def register_student(
+        registerNumber: str = Form(...),
+        file: UploadFile = File(...)
+    ):
+        """Register a new student's face"""
+        try:
+            if not registerNumber:
+                raise HTTPException(status_code=400, detail="Enrollment number is required")
+
+            # Read image, extract embedding, add to gallery and save
+            image_bytes = await file.read()
+            await run_inference(service.enroll_face, registerNumber, image_bytes)
+            await run_in_threadpool(gallery.save)
+
+            return {
+                "success": True,
+                "message": f"Student {registerNumber} registered successfully",
+                "enrollment_number": registerNumber
+            }
+
+        except HTTPException:
+            raise
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
+
+    @app.post("/sessions")
+    async def open_session(
+        roster: List[str] = Form(...),
+        startsAt: Optional[str] = Form(None),
+        endsAt: Optional[str] = Form(None)
+    ):
+        """Open an attendance session and preload the roster's embeddings"""
+        starts_at = parse_time(startsAt, "startsAt")
+        ends_at = parse_time(endsAt, "endsAt")
+        try:
+            session = service.sessions.open(roster, gallery, starts_at, ends_at)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return {
+            "session_id": session.session_id,
+            "starts_at": session.starts_at.isoformat(),
+            "ends_at": session.ends_at.isoformat(),
+            "roster_size": len(session.roster),
+            "preloaded": len(session.candidates),
+            "not_registered": [enroll_no for enroll_no in session.roster if enroll_no not in gallery]
+        }
+
+    @app.get("/sessions/{session_id}")
+    async def get_session(session_id: str):
+        """Get the attendance aggregated so far for an open session"""
+        return get_session_or_404(session_id).summary()
+
+    @app.post("/sessions/{session_id}/close")
+    async def close_session(session_id: str):
+        """Close a session and flush its aggregated attendance to the session log"""
+        summary = service.sessions.close(session_id)
+        if summary is None:
+            raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+        return summary
+
+    @app.post("/jobs/register-students", status_code=202)
+    async def submit_register_students(
+        registerNumbers: List[str] = Form(...),
+        files: List[UploadFile] = File(...)
+    ):
+        """Queue a batch enrollment job; returns the job ID immediately"""
+        payload = await read_batch(registerNumbers, files)
+        return submit_job("register-students", payload)
+
+    @app.post("/jobs/verify-batch", status_code=202)
+    async def submit_verify_batch(
+        registerNumbers: List[str] = Form(...),
+        files: List[UploadFile] = File(...)
+    ):
+        """Queue a batch verification job; returns the job ID immediately"""
+        payload = await read_batch(registerNumbers, files)
+        return submit_job("verify-batch", payload)
+
+    @app.get("/jobs/{job_id}")
+    async def get_job_status(job_id: str):
+        """Get a job's status and progress"""
+        job = job_manager.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        job.pop("result")
+        return job
+
+    @app.get("/jobs/{job_id}/result")
+    async def get_job_result(job_id: str, wait: float = Query(0.0, ge=0, le=MAX_JOB_WAIT_SECONDS)):
+        """Get a job's result, long-polling for up to `wait` seconds while it runs"""
+        # Poll with asyncio.sleep rather than blocking a threadpool thread, which
+        # inference needs; a few idle long-polls must not starve /verify-attendance
+        deadline = time.monotonic() + wait
+        job = job_manager.get(job_id)
+        while job is not None and job["status"] not in FINISHED_STATES and time.monotonic() < deadline:
+            await asyncio.sleep(min(JOB_POLL_INTERVAL_SECONDS, max(deadline - time.monotonic(), 0)))
+            job = job_manager.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        return job
+
+    return app
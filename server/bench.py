@@ -0,0 +1,62 @@
+# server/bench.py
+"""
+Micro-benchmark of the matching hot path.
+
+Compares the vectorized gallery search and a session roster search against the
+per-entry loop the old servers used, on random embeddings (no model needed):
+
+    python -m server.bench --dim 512 --sizes 100 1000 10000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from server.gallery import Gallery
+from server.metrics import get_metric
+
+
+def loop_match(face_db, embedding, metric):
+    """The per-entry search backend.py/app.py did before the gallery existed."""
+    best_match, best_score = None, None
+    for enroll_no, db_embedding in face_db.items():
+        _, score = metric.best(metric.prepare([db_embedding]), embedding)
+        if best_score is None or (score > best_score if metric.name == "cosine" else score < best_score):
+            best_match, best_score = enroll_no, score
+    return best_match, best_score
+
+
+def time_per_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark face matching")
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--roster", type=int, default=60)
+    parser.add_argument("--metric", default="cosine")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    metric = get_metric(args.metric)
+    rng = np.random.default_rng(0)
+    print(f"{'gallery':>8} {'loop ms':>10} {'gallery ms':>11} {'roster ms':>10}")
+    for size in args.sizes:
+        face_db = {f"S{i:06d}": rng.normal(size=args.dim).tolist() for i in range(size)}
+        gallery = Gallery("bench", metric, face_db)
+        roster, matrix = gallery.subset(list(face_db)[:args.roster])
+        query = rng.normal(size=args.dim)
+
+        loop_ms = time_per_call(lambda: loop_match(face_db, query, metric), max(1, args.repeat // 10))
+        gallery_ms = time_per_call(lambda: gallery.find_best_match(query), args.repeat)
+        roster_ms = time_per_call(lambda: metric.best(matrix, query), args.repeat)
+        print(f"{size:>8} {loop_ms:>10.3f} {gallery_ms:>11.3f} {roster_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
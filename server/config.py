@@ -0,0 +1,83 @@
+# server/config.py
+"""
+Server configuration.
+
+A preset picks a consistent model/detector/metric/threshold combination; any field
+can then be overridden with FACEAPP_* environment variables.
+"""
+
+import os
+from dataclasses import dataclass, field, replace
+from typing import List, Optional
+
+
+@dataclass
+class ServerConfig:
+    title: str = "Face Recognition Attendance API"
+    model_name: str = "ArcFace"
+    detector: str = "mtcnn"
+    # "cosine": higher is better, match if similarity >= threshold
+    # "euclidean": lower is better, match if distance <= threshold
+    metric: str = "cosine"
+    threshold: float = 0.25
+    gallery: str = "pickle"
+    db_file: str = "face_fast_db.pkl"
+    sink: str = "none"
+    cors_origins: List[str] = field(default_factory=lambda: ["*"])
+    jobs_db_file: str = "jobs.sqlite3"
+    session_log_file: str = "session_log.jsonl"
+    # Load the model in a background thread at startup instead of on the first request
+    warm_up: bool = True
+    # Concurrent face detection/embedding calls, across request handlers and job workers
+    inference_threads: int = field(default_factory=lambda: os.cpu_count() or 1)
+    host: str = "127.0.0.1"
+    port: int = 8001
+
+
+PRESETS = {
+    # ArcFace + MTCNN, cosine similarity (backend.py)
+    "arcface": ServerConfig(),
+    # Facenet + OpenCV, L2 distance (app.py / app1.py); built by register.py
+    "facenet": ServerConfig(
+        title="Fast Face Attendance API",
+        model_name="Facenet",
+        detector="opencv",
+        metric="euclidean",
+        threshold=10.0,
+        db_file="face_db.pkl",
+        host="0.0.0.0",
+        port=8000,
+    ),
+}
+
+# Environment variable -> (field, parser)
+ENV_OVERRIDES = {
+    "FACEAPP_MODEL": ("model_name", str),
+    "FACEAPP_DETECTOR": ("detector", str),
+    "FACEAPP_METRIC": ("metric", str),
+    "FACEAPP_THRESHOLD": ("threshold", float),
+    "FACEAPP_GALLERY": ("gallery", str),
+    "FACEAPP_DB_FILE": ("db_file", str),
+    "FACEAPP_SINK": ("sink", str),
+    "FACEAPP_CORS_ORIGINS": ("cors_origins", lambda value: [origin.strip() for origin in value.split(",")]),
+    "FACEAPP_JOBS_DB_FILE": ("jobs_db_file", str),
+    "FACEAPP_SESSION_LOG_FILE": ("session_log_file", str),
+    "FACEAPP_HOST": ("host", str),
+    "FACEAPP_WARM_UP": ("warm_up", lambda value: value.lower() not in ("0", "false", "no")),
+    "FACEAPP_INFERENCE_THREADS": ("inference_threads", int),
+    "PORT": ("port", int),
+}
+
+
+def load_config(preset: Optional[str] = None, **overrides) -> ServerConfig:
+    """Build a config from a preset (default: $FACEAPP_PRESET or "arcface"), env vars and keyword overrides."""
+    preset = preset or os.environ.get("FACEAPP_PRESET", "arcface")
+    if preset not in PRESETS:
+        raise ValueError(f"Unknown preset {preset!r}, expected one of {sorted(PRESETS)}")
+
+    values = {}
+    for env_name, (field_name, parse) in ENV_OVERRIDES.items():
+        if env_name in os.environ:
+            values[field_name] = parse(os.environ[env_name])
+    values.update(overrides)
+    return replace(PRESETS[preset], **values)
@@ -0,0 +1,89 @@
+# server/embedding.py
+"""
+Image decoding and face embedding extraction via DeepFace.
+
+DeepFace pulls in TensorFlow, which takes tens of seconds to import, so it is
+only imported on first use (or by ``Embedder.warm_up`` in a background thread).
+
+DeepFace's model cache is not thread-safe, so the model is loaded exactly once
+under a lock, and concurrent ``represent`` calls (request handlers and job
+workers alike) are bounded by a semaphore.
+"""
+
+import io
+import threading
+
+import numpy as np
+
+
+class InvalidImageError(ValueError):
+    """Raised when uploaded bytes cannot be decoded as an image."""
+
+
+def preprocess_image(image_bytes):
+    """Convert uploaded image bytes to a BGR numpy array for face recognition"""
+    from PIL import Image
+
+    try:
+        # Force RGB (handles RGBA/LA/PNG), then flip channels to OpenCV's BGR order
+        image = np.array(Image.open(io.BytesIO(image_bytes)).convert("RGB"))
+        return np.ascontiguousarray(image[:, :, ::-1])
+    except Exception as e:
+        raise InvalidImageError(f"Invalid image format: {str(e)}")
+
+
+class Embedder:
+    """Face detector + embedding model pair selected by config."""
+
+    def __init__(self, model_name, detector, max_concurrency=1):
+        self.model_name = model_name
+        self.detector = detector
+        self._load_lock = threading.Lock()
+        self._loaded = False
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def warm_up(self):
+        """
+        Import DeepFace and run one representation on a blank image, so the
+        model weights and the face detector are both loaded (and cached by
+        DeepFace) before the first request. Errors propagate to the caller.
+
+        Safe to call from several threads: callers that arrive while another
+        thread is loading wait for it instead of building the model again.
+        """
+        with self._load_lock:
+            if self._loaded:
+                return
+            from deepface import DeepFace
+
+            DeepFace.build_model(self.model_name)
+            DeepFace.represent(
+                np.zeros((224, 224, 3), dtype=np.uint8),
+                model_name=self.model_name,
+                detector_backend=self.detector,
+                enforce_detection=False
+            )
+            self._loaded = True
+
+    def represent(self, image):
+        """Extract a face embedding from a BGR image. Returns None if no face is detected."""
+        from deepface import DeepFace
+
+        self.warm_up()
+        try:
+            with self._slots:
+                reps = DeepFace.represent(
+                    image,
+                    model_name=self.model_name,
+                    detector_backend=self.detector,
+                    enforce_detection=False
+                )
+            if not reps or not isinstance(reps, list):
+                return None
+            embedding = reps[0].get("embedding")
+            if embedding is None:
+                return None
+            return np.array(embedding)
+        except Exception:
+            # Treat any detection/representation error as no face found
+            return None
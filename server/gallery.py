@@ -0,0 +1,193 @@
+# server/gallery.py
+"""
+Face gallery: registered embeddings plus the model they were computed with.
+
+Embeddings from different models are not comparable, so a gallery records the
+model name and embedding dimension it was built with and refuses to load or
+accept anything else.
+"""
+
+import os
+import pickle
+import threading
+
+import numpy as np
+
+# Known embedding sizes, used to validate legacy databases without metadata
+MODEL_DIMENSIONS = {
+    "ArcFace": 512,
+    "Facenet": 128,
+    "Facenet512": 512,
+    "OpenFace": 128,
+    "SFace": 128,
+    "Dlib": 128,
+    "DeepID": 160,
+}
+
+
+class GalleryMismatchError(Exception):
+    """Raised when embeddings do not match the gallery's model or dimension."""
+
+
+# ================= File format =================
+def read_gallery_file(path):
+    """
+    Read a gallery pickle and return ``(model_name, dim, embeddings)``.
+
+    Legacy files (a bare ``{enrollment_number: embedding}`` dict) have no model
+    metadata, in which case ``model_name`` and ``dim`` are None.
+    """
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+    if isinstance(data, dict) and "embeddings" in data and "model_name" in data:
+        return data["model_name"], data.get("dim"), data["embeddings"]
+    return None, None, data
+
+
+def write_gallery_file(path, model_name, embeddings, dim=None):
+    """Write embeddings with their model metadata, replacing the file atomically."""
+    dims = {len(embedding) for embedding in embeddings.values()}
+    if dim is not None:
+        dims.add(dim)
+    if len(dims) > 1:
+        raise GalleryMismatchError(f"Embeddings have mixed dimensions {sorted(dims)}")
+    data = {
+        "model_name": model_name,
+        "dim": dims.pop() if dims else MODEL_DIMENSIONS.get(model_name),
+        "embeddings": {key: list(map(float, embedding)) for key, embedding in embeddings.items()},
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+# ================= Galleries =================
+class Gallery:
+    """In-memory gallery searched with one vectorized metric call per query."""
+
+    def __init__(self, model_name, metric, embeddings=None, dim=None):
+        self.model_name = model_name
+        self.metric = metric
+        known_dim = MODEL_DIMENSIONS.get(model_name)
+        if dim is not None and known_dim is not None and dim != known_dim:
+            raise GalleryMismatchError(f"{model_name} embeddings are {known_dim}-d, not {dim}-d")
+        self.dim = dim or known_dim
+        self._lock = threading.RLock()
+        self._embeddings = {}
+        self._ids = []
+        self._index = {}
+        self._prepared = None
+
+        embeddings = embeddings or {}
+        for key, embedding in embeddings.items():
+            self._check_dim(key, np.asarray(embedding))
+        self._embeddings = {key: list(embedding) for key, embedding in embeddings.items()}
+        self._rebuild()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def ids(self):
+        return list(self._ids)
+
+    def metadata(self):
+        return {"model_name": self.model_name, "dim": self.dim, "count": len(self)}
+
+    def _check_dim(self, key, embedding):
+        if self.dim is None:
+            self.dim = embedding.shape[0]
+        if embedding.shape != (self.dim,):
+            raise GalleryMismatchError(
+                f"Embedding for {key} has shape {embedding.shape}, "
+                f"but the gallery holds {self.dim}-d {self.model_name} embeddings"
+            )
+
+    def _rebuild(self):
+        self._ids = list(self._embeddings)
+        self._index = {key: i for i, key in enumerate(self._ids)}
+        if self._ids:
+            self._prepared = np.ascontiguousarray(self.metric.prepare(np.array(list(self._embeddings.values()))))
+        else:
+            self._prepared = None
+
+    def add(self, key, embedding):
+        embedding = np.asarray(embedding, dtype=np.float32)
+        with self._lock:
+            self._check_dim(key, embedding)
+            self._embeddings[key] = embedding.tolist()
+            row = self.metric.prepare(embedding[np.newaxis, :])
+            if key in self._index:
+                # Copy on write so concurrent readers keep a consistent matrix
+                prepared = self._prepared.copy()
+                prepared[self._index[key]] = row[0]
+                self._prepared = prepared
+            else:
+                self._index[key] = len(self._ids)
+                self._ids = self._ids + [key]
+                self._prepared = row if self._prepared is None else np.vstack([self._prepared, row])
+
+    def find_best_match(self, embedding):
+        """Return ``(enrollment_number, score)`` of the best match, or ``(None, None)`` if empty."""
+        with self._lock:
+            ids, prepared = self._ids, self._prepared
+        if prepared is None:
+            return None, None
+        self._check_dim("query", np.asarray(embedding))
+        index, score = self.metric.best(prepared, embedding)
+        return ids[index], score
+
+    def subset(self, keys):
+        """Return the registered ``keys`` and a contiguous copy of their prepared rows."""
+        with self._lock:
+            present = [key for key in keys if key in self._index]
+            rows = [self._index[key] for key in present]
+            matrix = np.ascontiguousarray(self._prepared[rows]) if present else None
+        return present, matrix
+
+    def save(self):
+        pass
+
+
+class PickleGallery(Gallery):
+    """Gallery persisted to a pickle file."""
+
+    def __init__(self, path, model_name, metric):
+        self.path = path
+        # Orders concurrent saves without holding ``_lock`` while pickling
+        self._save_lock = threading.Lock()
+        dim, embeddings = None, {}
+        if os.path.exists(path):
+            file_model, dim, embeddings = read_gallery_file(path)
+            if file_model is None:
+                print(f"[!] {path} has no model metadata; assuming {model_name} (it is upgraded on the next save)")
+            elif file_model != model_name:
+                raise GalleryMismatchError(
+                    f"{path} was built with {file_model}, but the server is configured for {model_name}"
+                )
+            print(f"[+] Loaded {len(embeddings)} faces from database")
+        else:
+            print("[!] No face database found. Please run create_db.py first.")
+        super().__init__(model_name, metric, embeddings, dim)
+
+    def save(self):
+        with self._save_lock:
+            # Snapshot under the gallery lock, then serialize outside it so matching isn't stalled.
+            # add() replaces embedding lists rather than mutating them, so a shallow copy suffices.
+            with self._lock:
+                embeddings, dim = dict(self._embeddings), self.dim
+            write_gallery_file(self.path, self.model_name, embeddings, dim)
+
+
+GALLERY_BACKENDS = ("memory", "pickle")
+
+
+def open_gallery(config, metric):
+    if config.gallery == "pickle":
+        return PickleGallery(config.db_file, config.model_name, metric)
+    if config.gallery == "memory":
+        return Gallery(config.model_name, metric)
+    raise ValueError(f"Unknown gallery backend {config.gallery!r}, expected one of {list(GALLERY_BACKENDS)}")
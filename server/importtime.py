@@ -0,0 +1,74 @@
+# server/importtime.py
+"""
+Import-time profile of the server entry points.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter and
+sums self time per top-level package (``deepface.*`` -> ``deepface``), so
+startup regressions (e.g. an eager TensorFlow import) are easy to spot:
+
+    python -m server.importtime backend server.app --top 15
+    python -m server.importtime backend --max-ms 1500   # exit 1 if slower
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+
+# "import time: self [us] | cumulative | imported package"
+LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+
+def profile_import(module):
+    """Return ``(total_ms, [(package, self_ms), ...])`` for importing ``module``, slowest first."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+
+    packages = {}
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, _, name = match.groups()
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+        total_us += int(self_us)
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    return total_us / 1000, [(package, us / 1000) for package, us in ranked]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize -X importtime for server entry points")
+    parser.add_argument("modules", nargs="*", default=["backend"], help="Modules to import (default: backend)")
+    parser.add_argument("--top", type=int, default=10, help="Number of packages to list per module")
+    parser.add_argument("--max-ms", type=float, help="Exit with status 1 if any module takes longer than this")
+    parser.add_argument("--json-out", help="Write the report to this file")
+    args = parser.parse_args()
+
+    report = {}
+    slow = False
+    for module in args.modules:
+        total_ms, packages = profile_import(module)
+        report[module] = {"total_ms": round(total_ms, 1), "packages": dict(packages[:args.top])}
+        print(f"import {module}: {total_ms:.1f} ms")
+        for package, ms in packages[:args.top]:
+            print(f"  {ms:10.1f} ms  {package}")
+        if args.max_ms is not None and total_ms > args.max_ms:
+            print(f"[!] import {module} exceeds {args.max_ms:.0f} ms budget")
+            slow = True
+
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(1 if slow else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# server/jobs.py
+"""
+Background job subsystem for long-running enrollment and verification batches.
+
+Jobs are submitted to a bounded in-process queue and drained by worker threads,
+so bulk work never ties up the request handlers serving interactive verification.
+Job status, progress and results are persisted in a small SQLite store so they
+survive server restarts.
+"""
+
+import json
+import math
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+# ================= CONFIG =================
+JOBS_DB_FILE = "jobs.sqlite3"
+QUEUE_SIZE = 32
+NUM_WORKERS = 2
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATES = (SUCCEEDED, FAILED)
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the work queue is at capacity."""
+
+
+# ================= Persistent store =================
+class JobStore:
+    """SQLite-backed store for job status, progress and results."""
+
+    def __init__(self, path=JOBS_DB_FILE):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                done INTEGER NOT NULL DEFAULT 0,
+                total INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def create(self, job_id, kind, total):
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, total, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, total, now, now),
+            )
+            self._conn.commit()
+
+    def update(self, job_id, **fields):
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"])
+        fields["updated_at"] = datetime.now().isoformat()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET {columns} WHERE id = ?",
+                (*fields.values(), job_id),
+            )
+            self._conn.commit()
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, kind, status, done, total, result, error, created_at, updated_at "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row[0],
+            "kind": row[1],
+            "status": row[2],
+            "progress": {"done": row[3], "total": row[4]},
+            "result": json.loads(row[5]) if row[5] is not None else None,
+            "error": row[6],
+            "created_at": row[7],
+            "updated_at": row[8],
+        }
+
+    def fail_unfinished(self, reason):
+        """Mark jobs left queued/running by a previous process as failed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? "
+                "WHERE status IN (?, ?)",
+                (FAILED, reason, datetime.now().isoformat(), QUEUED, RUNNING),
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+
+# ================= Job manager =================
+class JobManager:
+    """
+    Bounded work queue drained by background worker threads.
+
+    Handlers are registered per job kind and are called as
+    ``handler(payload, report_progress)``; ``report_progress(done)`` updates the
+    persisted progress counter and the handler's return value becomes the result.
+    """
+
+    def __init__(self, store, maxsize=QUEUE_SIZE, num_workers=NUM_WORKERS):
+        self.store = store
+        self.num_workers = num_workers
+        self._handlers = {}
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._workers = []
+        self._finished = threading.Condition()
+        # Serializes submit/stop so the room check and the put cannot race
+        self._submit_lock = threading.Lock()
+        self._stopping = False
+
+    def register(self, kind, handler):
+        self._handlers[kind] = handler
+
+    def start(self):
+        # Payloads (uploaded images) are only held in memory, so jobs that did
+        # not finish before a restart cannot be resumed.
+        stale = self.store.fail_unfinished("Interrupted by server restart")
+        if stale:
+            print(f"[!] Marked {stale} unfinished jobs as failed")
+        for i in range(self.num_workers):
+            worker = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self):
+        """Fail jobs still waiting in the queue and wait only for running ones."""
+        with self._submit_lock:
+            self._stopping = True
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self.store.update(item[0], status=FAILED, error="Cancelled by server shutdown")
+            for _ in self._workers:
+                self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+        with self._finished:
+            self._finished.notify_all()
+
+    def submit(self, kind, payload, total):
+        """Queue a job and return its ID without waiting for it to run."""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        with self._submit_lock:
+            # Only submit adds to the queue, so there is still room after this check
+            if self._stopping or self._queue.full():
+                raise QueueFullError("Job queue is full, try again later")
+            job_id = uuid.uuid4().hex
+            self.store.create(job_id, kind, total)
+            self._queue.put_nowait((job_id, kind, payload))
+        return job_id
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def wait(self, job_id, timeout):
+        """Block until the job finishes or ``timeout`` seconds pass; return its record."""
+        if not math.isfinite(timeout):
+            raise ValueError(f"timeout must be a finite number of seconds, got {timeout}")
+        deadline = time.monotonic() + timeout
+        with self._finished:
+            while True:
+                job = self.store.get(job_id)
+                if job is None or job["status"] in FINISHED_STATES:
+                    return job
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return job
+                self._finished.wait(remaining)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            job_id, kind, payload = item
+            self.store.update(job_id, status=RUNNING)
+
+            def report_progress(done, job_id=job_id):
+                self.store.update(job_id, done=done)
+
+            try:
+                result = self._handlers[kind](payload, report_progress)
+                self.store.update(job_id, status=SUCCEEDED, result=result)
+            except Exception as e:
+                self.store.update(job_id, status=FAILED, error=str(e))
+            finally:
+                with self._finished:
+                    self._finished.notify_all()
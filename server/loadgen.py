@@ -0,0 +1,356 @@
+# server/loadgen.py
+"""
+Load generator and soak-test harness for the attendance API.
+
+Drives /verify-attendance and /register-student with open-loop arrivals: a
+Poisson background rate plus optional bursts that mimic the start of a class.
+Requests are replayed from a JSONL file of records such as
+
+    {"endpoint": "verify-attendance", "registerNumber": "23BCE1745", "image": "kan.png"}
+
+or synthesized from the sample images. Latency percentiles, error rate,
+throughput and memory (RSS) growth are reported periodically and at the end.
+
+    # Start the configured server (FACEAPP_* env vars) under uvicorn in a child process
+    python -m server.loadgen --rate 5 --duration 600 --burst-every 120 --burst-size 60
+
+    # Against a running server, watching its memory
+    python -m server.loadgen --url http://127.0.0.1:8001 --server-pid 1234 --duration 3600
+
+The server runs in its own process so its inference never delays the arrival
+schedule, and RSS is measured for the server alone. Latency is timed from each
+request's scheduled arrival, so queueing delay is included. Local runs use a
+scratch copy of the gallery; with --url, registrations are off unless
+--register-ratio is given, since they would be saved to the real database.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+import numpy as np
+
+ENDPOINTS = ("verify-attendance", "register-student")
+
+# Sample enrollments shipped with the repo (see create_db.py)
+SAMPLE_ENROLLMENTS = [
+    ("23BCE1745", "kan.png"),
+    ("23BCE1803", "cav.png"),
+    ("23BCE1812", "bha.png"),
+    ("23BCE1766", "jey.png"),
+    ("23BCE1864", "adhi.png"),
+]
+
+
+# ================= Request records =================
+def load_records(path):
+    """Read request records from a JSONL file, skipping lines that are not API requests."""
+    records = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get("endpoint") in ENDPOINTS and record.get("registerNumber") and record.get("image"):
+                records.append(record)
+    return records
+
+
+def synthesize_records(register_ratio):
+    """
+    Build a weighted record pool from the sample images: genuine verifications,
+    impostor verifications (someone else's photo) and re-registrations under
+    load-test enrollment numbers.
+    """
+    pool = []
+    for i, (enroll_no, image) in enumerate(SAMPLE_ENROLLMENTS):
+        impostor = SAMPLE_ENROLLMENTS[(i + 1) % len(SAMPLE_ENROLLMENTS)][1]
+        pool.append(({"endpoint": "verify-attendance", "registerNumber": enroll_no, "image": image}, 0.8))
+        pool.append(({"endpoint": "verify-attendance", "registerNumber": enroll_no, "image": impostor}, 0.2))
+    weights = np.array([weight for _, weight in pool]) * (1 - register_ratio) / sum(weight for _, weight in pool)
+    records = [record for record, _ in pool]
+
+    if register_ratio > 0:
+        for enroll_no, image in SAMPLE_ENROLLMENTS:
+            records.append({"endpoint": "register-student", "registerNumber": f"LOAD-{enroll_no}", "image": image})
+        weights = np.concatenate([weights, np.full(len(SAMPLE_ENROLLMENTS), register_ratio / len(SAMPLE_ENROLLMENTS))])
+    return records, weights
+
+
+def arrival_times(rate, duration, burst_every, burst_size, burst_spread, rng):
+    """Open-loop send times in seconds: Poisson arrivals plus periodic bursts."""
+    times = []
+    if rate > 0:
+        t = rng.exponential(1 / rate)
+        while t < duration:
+            times.append(t)
+            t += rng.exponential(1 / rate)
+    if burst_every > 0:
+        for start in np.arange(0, duration, burst_every):
+            times.extend(start + rng.uniform(0, burst_spread, burst_size))
+    return sorted(t for t in times if t < duration)
+
+
+# ================= Measurement =================
+def rss_mb(pid="self"):
+    """Current resident set size in MB (Linux), or None if unavailable."""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return None
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.outcomes = Counter()
+        self.started = time.monotonic()
+
+    def add(self, latency, outcome):
+        self.latencies.append(latency)
+        self.outcomes[outcome] += 1
+
+    def summary(self):
+        elapsed = time.monotonic() - self.started
+        completed = len(self.latencies)
+        errors = sum(count for outcome, count in self.outcomes.items() if outcome not in ("ok", "rejected"))
+        percentiles = np.percentile(self.latencies, [50, 95, 99]) * 1000 if completed else [0.0, 0.0, 0.0]
+        return {
+            "completed": completed,
+            "errors": errors,
+            "error_rate": errors / completed if completed else 0.0,
+            "throughput_rps": completed / elapsed if elapsed else 0.0,
+            "p50_ms": float(percentiles[0]),
+            "p95_ms": float(percentiles[1]),
+            "p99_ms": float(percentiles[2]),
+            "outcomes": dict(self.outcomes),
+        }
+
+
+async def send(client, record, images, timeout, scheduled, on_done):
+    loop = asyncio.get_running_loop()
+    try:
+        response = await client.post(
+            f"/{record['endpoint']}",
+            data={"registerNumber": record["registerNumber"]},
+            files={"file": (os.path.basename(record["image"]), images[record["image"]])},
+            timeout=timeout,
+        )
+        if response.status_code >= 400:
+            outcome = f"http_{response.status_code}"
+        else:
+            # ABSENT verifications are valid responses, tracked separately from errors
+            outcome = "ok" if response.json().get("success") else "rejected"
+    except Exception as e:
+        # Transport errors, timeouts and unparseable bodies all count as errors;
+        # letting one escape would skip on_done and abort the run without a summary
+        outcome = type(e).__name__
+    # Timed from the scheduled arrival, not the send, so queueing delay is not hidden
+    on_done(loop.time() - scheduled, outcome)
+
+
+# ================= Runner =================
+async def run_load(client, schedule, records, weights, images, args, memory_pid):
+    loop = asyncio.get_running_loop()
+    rng = np.random.default_rng(args.seed + 1)
+    total = Stats()
+    window = [Stats()]
+    memory = []
+    dropped = 0
+    in_flight = set()
+
+    def on_done(latency, outcome):
+        total.add(latency, outcome)
+        window[0].add(latency, outcome)
+
+    def sample_memory():
+        rss = rss_mb(memory_pid)
+        if rss is not None:
+            memory.append((time.monotonic() - total.started, rss))
+        return rss
+
+    async def report():
+        while True:
+            await asyncio.sleep(args.report_interval)
+            s = window[0].summary()
+            window[0] = Stats()
+            rss = sample_memory()
+            growth = f" ({rss - memory[0][1]:+.1f}MB)" if rss is not None else ""
+            print(
+                f"[{time.monotonic() - total.started:7.0f}s] done {s['completed']:5d} err {s['errors']:4d} "
+                f"rps {s['throughput_rps']:6.1f} p50 {s['p50_ms']:7.1f}ms p95 {s['p95_ms']:7.1f}ms "
+                f"p99 {s['p99_ms']:7.1f}ms in-flight {len(in_flight):4d} "
+                f"rss {rss if rss is not None else float('nan'):.0f}MB{growth}"
+            )
+
+    sample_memory()
+    reporter = asyncio.create_task(report())
+    start = loop.time()
+    for t in schedule:
+        delay = start + t - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= args.max_in_flight:
+            # Open loop: never wait for the server, count the arrival as dropped instead
+            dropped += 1
+            continue
+        record = records[rng.choice(len(records), p=weights)]
+        task = asyncio.create_task(send(client, record, images, args.timeout, start + t, on_done))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    reporter.cancel()
+    sample_memory()
+
+    summary = total.summary()
+    summary["scheduled"] = len(schedule)
+    summary["dropped"] = dropped
+    if memory:
+        summary["rss_start_mb"] = memory[0][1]
+        summary["rss_end_mb"] = memory[-1][1]
+        summary["rss_growth_mb"] = memory[-1][1] - memory[0][1]
+        if len(memory) > 2:
+            # Slope of a linear fit, robust to a one-off jump at warm-up
+            elapsed, rss = zip(*memory)
+            summary["rss_growth_mb_per_hour"] = float(np.polyfit(elapsed, rss, 1)[0] * 3600)
+    return summary
+
+
+# ================= Local server =================
+def start_local_server(scratch_dir):
+    """Run the configured server under uvicorn in a child process, on a scratch copy of its gallery."""
+    from server.config import load_config
+
+    config = load_config()
+    db_file = os.path.join(scratch_dir, os.path.basename(config.db_file))
+    if os.path.exists(config.db_file):
+        shutil.copy(config.db_file, db_file)
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    env = dict(
+        os.environ,
+        FACEAPP_DB_FILE=db_file,
+        FACEAPP_JOBS_DB_FILE=os.path.join(scratch_dir, "jobs.sqlite3"),
+        FACEAPP_SESSION_LOG_FILE=os.path.join(scratch_dir, "session_log.jsonl"),
+        FACEAPP_HOST="127.0.0.1",
+        PORT=str(port),
+    )
+    proc = subprocess.Popen([sys.executable, "-m", "server"], env=env)
+    return proc, f"http://127.0.0.1:{port}"
+
+
+async def wait_until_ready(client, proc, timeout):
+    """Wait for /health to answer and the model warm-up to finish; raise if the warm-up failed."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited with code {proc.returncode} during startup")
+        try:
+            response = await client.get("/health", timeout=5)
+            status = response.json().get("status") if response.status_code == 200 else None
+            if status == "degraded":
+                raise RuntimeError("Server model warm-up failed (/health reports degraded)")
+            if status is not None and status != "warming":
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.5)
+    raise RuntimeError(f"Server was not ready after {timeout:.0f}s")
+
+
+def stop_local_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+async def main_async(args):
+    rng = np.random.default_rng(args.seed)
+    if args.register_ratio is None:
+        args.register_ratio = 0.0 if args.url else 0.05
+    if args.requests:
+        records = load_records(args.requests)
+        weights = np.full(len(records), 1 / len(records)) if records else None
+    else:
+        records = []
+    if not records:
+        if args.requests:
+            print(f"[!] No API request records in {args.requests}; synthesizing from sample images")
+        records, weights = synthesize_records(args.register_ratio)
+
+    images = {}
+    for record in records:
+        if record["image"] not in images:
+            with open(record["image"], "rb") as f:
+                images[record["image"]] = f.read()
+
+    schedule = arrival_times(args.rate, args.duration, args.burst_every, args.burst_size, args.burst_spread, rng)
+    print(f"[*] {len(schedule)} requests over {args.duration:.0f}s from {len(records)} distinct records")
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url) as client:
+            return await run_load(client, schedule, records, weights, images, args, args.server_pid)
+
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        proc, url = start_local_server(scratch_dir)
+        try:
+            async with httpx.AsyncClient(base_url=url) as client:
+                await wait_until_ready(client, proc, args.startup_timeout)
+                print(f"[*] Server ready at {url} (pid {proc.pid})")
+                return await run_load(client, schedule, records, weights, images, args, proc.pid)
+        finally:
+            stop_local_server(proc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load and soak test the attendance API")
+    parser.add_argument("--requests", help="JSONL file of request records (default: synthesize from sample images)")
+    parser.add_argument("--url", help="Base URL of a running server (default: start one in a child process)")
+    parser.add_argument("--server-pid", type=int, help="PID of the server to watch for memory growth with --url")
+    parser.add_argument("--rate", type=float, default=2.0, help="Background Poisson arrival rate (requests/s)")
+    parser.add_argument("--duration", type=float, default=60.0, help="Test length in seconds")
+    parser.add_argument("--burst-every", type=float, default=0.0, help="Seconds between bursts (0 disables bursts)")
+    parser.add_argument("--burst-size", type=int, default=60, help="Requests per burst, e.g. one class")
+    parser.add_argument("--burst-spread", type=float, default=10.0, help="Seconds over which a burst arrives")
+    parser.add_argument(
+        "--register-ratio", type=float,
+        help="Share of synthesized registrations (default: 0.05 locally, 0 with --url to protect its gallery)"
+    )
+    parser.add_argument("--startup-timeout", type=float, default=300.0, help="Seconds to wait for a local server")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Drop arrivals beyond this many open requests")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--report-interval", type=float, default=10.0, help="Seconds between progress lines")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json-out", help="Write the final summary to this file")
+    args = parser.parse_args()
+
+    summary = asyncio.run(main_async(args))
+    print(json.dumps(summary, indent=2))
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
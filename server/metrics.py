@@ -0,0 +1,59 @@
+# server/metrics.py
+"""
+Match metrics over an embedding matrix.
+
+Each metric prepares gallery rows once (e.g. L2-normalizes them for cosine) so a
+query is scored against the whole gallery with a single vectorized operation.
+"""
+
+import numpy as np
+
+
+class CosineMetric:
+    """Cosine similarity: higher is better (1.0 = identical)."""
+
+    name = "cosine"
+
+    def prepare(self, matrix):
+        matrix = np.asarray(matrix, dtype=np.float32)
+        return matrix / (np.linalg.norm(matrix, axis=-1, keepdims=True) + 1e-10)
+
+    def best(self, prepared, query):
+        scores = prepared @ self.prepare(query)
+        index = int(np.argmax(scores))
+        return index, float(scores[index])
+
+    def accepts(self, score, threshold):
+        return score >= threshold
+
+    def confidence(self, score):
+        return float(np.clip(score, 0.0, 1.0))
+
+
+class EuclideanMetric:
+    """L2 distance: lower is better (0.0 = identical)."""
+
+    name = "euclidean"
+
+    def prepare(self, matrix):
+        return np.asarray(matrix, dtype=np.float32)
+
+    def best(self, prepared, query):
+        distances = np.linalg.norm(prepared - self.prepare(query), axis=1)
+        index = int(np.argmin(distances))
+        return index, float(distances[index])
+
+    def accepts(self, score, threshold):
+        return score <= threshold
+
+    def confidence(self, score):
+        return 1.0 / (1.0 + score)
+
+
+METRICS = {metric.name: metric for metric in (CosineMetric(), EuclideanMetric())}
+
+
+def get_metric(name):
+    if name not in METRICS:
+        raise ValueError(f"Unknown metric {name!r}, expected one of {sorted(METRICS)}")
+    return METRICS[name]
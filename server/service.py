@@ -0,0 +1,156 @@
+# server/service.py
+"""Attendance service: the verification/enrollment hot path shared by every endpoint."""
+
+import time
+from datetime import datetime
+
+from server.embedding import Embedder, preprocess_image
+from server.gallery import open_gallery
+from server.metrics import get_metric
+from server.sessions import SessionManager
+from server.sinks import open_sink
+
+
+class NoFaceDetectedError(ValueError):
+    """Raised when an enrollment image contains no detectable face."""
+
+
+class AttendanceService:
+    def __init__(self, config):
+        self.config = config
+        self.metric = get_metric(config.metric)
+        self.embedder = Embedder(config.model_name, config.detector, config.inference_threads)
+        self.gallery = open_gallery(config, self.metric)
+        self.sink = open_sink(config.sink)
+        self.sessions = SessionManager(config.session_log_file)
+        # "cold" until warm_up runs, then "warming" -> "ready" or "failed"
+        self.model_state = "cold"
+        self.model_error = None
+
+    def warm_up(self):
+        """Import the embedding model stack and load its weights (run in a background thread)."""
+        self.model_state = "warming"
+        start = time.monotonic()
+        try:
+            self.embedder.warm_up()
+        except Exception as e:
+            self.model_error = str(e)
+            self.model_state = "failed"
+            print(f"[!] Failed to load {self.config.model_name} model: {e}")
+            return
+        self.model_state = "ready"
+        print(f"[+] {self.config.model_name} model loaded in {time.monotonic() - start:.1f}s")
+
+    def match_face(self, registerNumber, image_bytes, session=None):
+        """Compare an uploaded face image with an enrollment number's registered face"""
+        # Check if enrollment number exists in database
+        if registerNumber not in self.gallery:
+            return {
+                "success": False,
+                "message": f"Enrollment number {registerNumber} not found in database",
+                "status": "ABSENT",
+                "enrollment_number": registerNumber,
+                "timestamp": datetime.now().isoformat()
+            }
+
+        # Preprocess uploaded image and extract face embedding
+        image = preprocess_image(image_bytes)
+        face_embedding = self.embedder.represent(image)
+
+        if face_embedding is None:
+            return {
+                "success": False,
+                "message": "No detectable face in the image. Please try again with your face centered and well-lit.",
+                "status": "ABSENT",
+                "enrollment_number": registerNumber,
+                "confidence": 0.0,
+                "timestamp": datetime.now().isoformat()
+            }
+
+        # Find best match, against the session's preloaded roster when possible
+        if session is not None and session.has_candidate(registerNumber):
+            best_match, score = session.find_best_match(face_embedding)
+        else:
+            best_match, score = self.gallery.find_best_match(face_embedding)
+
+        if best_match is None:
+            is_match, confidence = False, 0.0
+        else:
+            is_match = best_match == registerNumber and self.metric.accepts(score, self.config.threshold)
+            confidence = self.metric.confidence(score)
+
+        if is_match:
+            result = {
+                "success": True,
+                "message": f"Attendance verified for {registerNumber}",
+                "status": "PRESENT",
+                "enrollment_number": registerNumber,
+                "confidence": round(confidence, 3),
+                "timestamp": datetime.now().isoformat()
+            }
+            result.update(self.sink.record(registerNumber, result))
+            return result
+        else:
+            return {
+                "success": False,
+                "message": f"Face does not match enrollment number {registerNumber}",
+                "status": "ABSENT",
+                "enrollment_number": registerNumber,
+                "confidence": round(confidence, 3),
+                "timestamp": datetime.now().isoformat()
+            }
+
+    def verify_face(self, registerNumber, image_bytes, session=None):
+        """Verify an uploaded face image, recording the result in the attendance session if given"""
+        if session is not None and not session.is_active():
+            return {
+                "success": False,
+                "message": f"Session {session.session_id} is not open at this time",
+                "status": "ABSENT",
+                "enrollment_number": registerNumber,
+                "timestamp": datetime.now().isoformat()
+            }
+
+        result = self.match_face(registerNumber, image_bytes, session)
+        if session is not None:
+            session.record(registerNumber, result["status"], result.get("confidence", 0.0), result["timestamp"])
+        return result
+
+    def enroll_face(self, registerNumber, image_bytes):
+        """Compute a student's face embedding and add it to the gallery (without saving)"""
+        image = preprocess_image(image_bytes)
+        face_embedding = self.embedder.represent(image)
+        if face_embedding is None:
+            raise NoFaceDetectedError("No detectable face in the image")
+        self.gallery.add(registerNumber, face_embedding)
+        # Open sessions snapshot their roster's embeddings; keep them current
+        self.sessions.refresh(registerNumber, self.gallery)
+
+    # ================= Background jobs =================
+    def run_register_batch(self, payload, report_progress):
+        """Enroll a batch of students, rewriting the database once at the end"""
+        results = []
+        for i, (registerNumber, image_bytes) in enumerate(payload):
+            try:
+                self.enroll_face(registerNumber, image_bytes)
+                results.append({"enrollment_number": registerNumber, "success": True})
+            except Exception as e:
+                results.append({"enrollment_number": registerNumber, "success": False, "error": str(e)})
+            report_progress(i + 1)
+
+        if any(item["success"] for item in results):
+            self.gallery.save()
+
+        return {"registered": sum(item["success"] for item in results), "items": results}
+
+    def run_verify_batch(self, payload, report_progress):
+        """Verify a batch of (enrollment number, image) pairs"""
+        results = []
+        for i, (registerNumber, image_bytes) in enumerate(payload):
+            try:
+                results.append(self.verify_face(registerNumber, image_bytes))
+            except Exception as e:
+                results.append({"success": False, "enrollment_number": registerNumber, "error": str(e)})
+            report_progress(i + 1)
+
+        return {"verified": sum(item["success"] for item in results), "items": results}
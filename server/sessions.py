@@ -0,0 +1,158 @@
+# server/sessions.py
+"""
+Attendance sessions with a preloaded candidate subset.
+
+An instructor opens a session with the roster of a lecture and a time window.
+The roster's prepared embeddings are copied out of the gallery into a small
+contiguous matrix so verifications tagged with the session ID are scored
+against the class instead of the whole university database. Results are
+aggregated in memory and appended to a log file when the session is closed,
+or when it is next looked up after its window has ended.
+"""
+
+import json
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+# ================= CONFIG =================
+SESSION_LOG_FILE = "session_log.jsonl"
+DEFAULT_SESSION_MINUTES = 90
+
+
+class AttendanceSession:
+    """A roster, its embedding sub-matrix and the results recorded so far."""
+
+    def __init__(self, session_id, roster, gallery, starts_at, ends_at):
+        self.session_id = session_id
+        self.roster = list(dict.fromkeys(roster))
+        self._roster_set = set(self.roster)
+        self.starts_at = starts_at
+        self.ends_at = ends_at
+        self.results = {}
+        self._lock = threading.Lock()
+
+        self.metric = gallery.metric
+        self.refresh(gallery)
+
+    def refresh(self, gallery):
+        """Re-copy the roster's embeddings, e.g. after a roster student (re-)enrolls."""
+        candidates, matrix = gallery.subset(self.roster)
+        index = {enroll_no: i for i, enroll_no in enumerate(candidates)}
+        # Swapped in one assignment so concurrent matches see a consistent snapshot
+        self._snapshot = (candidates, matrix, index)
+
+    @property
+    def candidates(self):
+        return self._snapshot[0]
+
+    def is_active(self, now=None):
+        now = now or datetime.now()
+        return self.starts_at <= now <= self.ends_at
+
+    def is_expired(self, now=None):
+        return (now or datetime.now()) > self.ends_at
+
+    def has_roster_member(self, enroll_no):
+        return enroll_no in self._roster_set
+
+    def has_candidate(self, enroll_no):
+        return enroll_no in self._snapshot[2]
+
+    def find_best_match(self, embedding):
+        """Return ``(enrollment_number, score)`` of the best roster match, or ``(None, None)``."""
+        candidates, matrix, _ = self._snapshot
+        if not candidates:
+            return None, None
+        index, score = self.metric.best(matrix, embedding)
+        return candidates[index], score
+
+    def record(self, enroll_no, status, confidence, timestamp):
+        """Keep each roster student's best result; a PRESENT is never downgraded."""
+        if enroll_no not in self._roster_set:
+            return
+        with self._lock:
+            previous = self.results.get(enroll_no)
+            if previous is not None:
+                if previous["status"] == "PRESENT" and status != "PRESENT":
+                    return
+                if previous["status"] == status and confidence <= previous["confidence"]:
+                    return
+            self.results[enroll_no] = {
+                "status": status,
+                "confidence": confidence,
+                "timestamp": timestamp,
+            }
+
+    def summary(self):
+        with self._lock:
+            results = dict(self.results)
+        present = [enroll_no for enroll_no in self.roster if results.get(enroll_no, {}).get("status") == "PRESENT"]
+        return {
+            "session_id": self.session_id,
+            "starts_at": self.starts_at.isoformat(),
+            "ends_at": self.ends_at.isoformat(),
+            "roster_size": len(self.roster),
+            "preloaded": len(self.candidates),
+            "present": present,
+            "absent": [enroll_no for enroll_no in self.roster if enroll_no not in present],
+            "results": results,
+        }
+
+
+class SessionManager:
+    """Registry of open sessions."""
+
+    def __init__(self, log_file=SESSION_LOG_FILE):
+        self.log_file = log_file
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def open(self, roster, gallery, starts_at=None, ends_at=None):
+        starts_at = starts_at or datetime.now()
+        ends_at = ends_at or starts_at + timedelta(minutes=DEFAULT_SESSION_MINUTES)
+        if ends_at <= starts_at:
+            raise ValueError("Session must end after it starts")
+        self.close_expired()
+        session = AttendanceSession(uuid.uuid4().hex, roster, gallery, starts_at, ends_at)
+        with self._lock:
+            self._sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id):
+        self.close_expired()
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def refresh(self, enroll_no, gallery):
+        """Update the roster matrix of every open session that lists ``enroll_no``."""
+        with self._lock:
+            sessions = [session for session in self._sessions.values() if session.has_roster_member(enroll_no)]
+        for session in sessions:
+            session.refresh(gallery)
+
+    def close_expired(self):
+        """Close and flush every session whose window has ended."""
+        now = datetime.now()
+        with self._lock:
+            expired = [session for session in self._sessions.values() if session.is_expired(now)]
+            for session in expired:
+                del self._sessions[session.session_id]
+        for session in expired:
+            self._flush(session)
+
+    def close(self, session_id):
+        """Remove a session and append its aggregated results to the log file."""
+        self.close_expired()
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is None:
+            return None
+        return self._flush(session)
+
+    def _flush(self, session):
+        summary = session.summary()
+        summary["closed_at"] = datetime.now().isoformat()
+        with open(self.log_file, "a") as f:
+            f.write(json.dumps(summary) + "\n")
+        return summary
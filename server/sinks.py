@@ -0,0 +1,69 @@
+# server/sinks.py
+"""
+Attendance sinks: where verified attendance is recorded besides the API response.
+
+``record`` is called for every PRESENT verification and returns extra fields to
+merge into the response.
+"""
+
+import os
+import random
+import threading
+
+
+class NullSink:
+    """Record nothing."""
+
+    def record(self, register_number, result):
+        return {}
+
+
+class SheetsSink:
+    """Append verified attendance with a random code to a Google Sheet."""
+
+    SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+
+    def __init__(self):
+        self.spreadsheet_id = os.environ.get("SHEET_ID")
+        self._service = None
+        # The client's httplib2 transport is not thread-safe; record() is called
+        # from request handlers and job workers, so every use goes through this lock.
+        self._lock = threading.Lock()
+
+    @property
+    def service(self):
+        """Sheets API client, built on first use rather than at startup. Callers hold ``_lock``."""
+        if self._service is None:
+            from google.oauth2 import service_account
+            from googleapiclient.discovery import build
+
+            # Service account is loaded from the environment (Render)
+            credentials_dict = {
+                "type": "service_account",
+                "private_key": os.environ.get("GOOGLE_PRIVATE_KEY", "").replace("\\n", "\n"),
+                "client_email": os.environ.get("GOOGLE_SERVICE_ACCOUNT_EMAIL"),
+                "token_uri": "https://oauth2.googleapis.com/token"
+            }
+            credentials = service_account.Credentials.from_service_account_info(credentials_dict, scopes=self.SCOPES)
+            self._service = build("sheets", "v4", credentials=credentials)
+        return self._service
+
+    def record(self, register_number, result):
+        attendance_code = f"CODE-{random.randint(1000, 9999)}"
+        with self._lock:
+            self.service.spreadsheets().values().append(
+                spreadsheetId=self.spreadsheet_id,
+                range="Sheet1!A:B",
+                valueInputOption="RAW",
+                body={"values": [[register_number, attendance_code]]}
+            ).execute()
+        return {"code": attendance_code}
+
+
+SINKS = {"none": NullSink, "sheets": SheetsSink}
+
+
+def open_sink(name):
+    if name not in SINKS:
+        raise ValueError(f"Unknown sink {name!r}, expected one of {sorted(SINKS)}")
+    return SINKS[name]()
@@ -4,6 +4,7 @@ Face Recognition Attendance System Startup Script
 This script helps you start both the backend and frontend components
 """
 
+import importlib.util
 import subprocess
 import sys
 import time
@@ -13,19 +14,17 @@ import webbrowser
 from pathlib import Path
 
 def check_requirements():
-    """Check if all required packages are installed"""
-    try:
-        import fastapi
-        import streamlit
-        import deepface
-        import cv2
-        import numpy
-        print("✅ All required packages are installed")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing package: {e}")
+    """Check if all required packages are installed (without importing them)"""
+    missing = [
+        name for name in ("fastapi", "streamlit", "deepface", "cv2", "numpy")
+        if importlib.util.find_spec(name) is None
+    ]
+    if missing:
+        print(f"❌ Missing packages: {', '.join(missing)}")
         print("Please install requirements: pip install -r requirements.txt")
         return False
+    print("✅ All required packages are installed")
+    return True
 
 def start_backend():
     """Start the FastAPI backend server"""
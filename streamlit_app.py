@@ -21,6 +21,8 @@ with st.sidebar:
         if health_response.status_code == 200:
             health_data = health_response.json()
             st.success("✅ Backend Connected")
+            if health_data.get("status") == "warming":
+                st.info("⏳ Face recognition model is still loading...")
             st.info(f"Registered Students: {health_data.get('registered_faces', 0)}")
         else:
             st.error("❌ Backend Error")
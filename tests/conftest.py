@@ -0,0 +1,14 @@
+import pytest
+
+from server.app import create_app
+from server.config import load_config
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """An app with an empty in-memory gallery and no model warm-up, so DeepFace is never imported."""
+    monkeypatch.setenv("FACEAPP_GALLERY", "memory")
+    monkeypatch.setenv("FACEAPP_WARM_UP", "0")
+    monkeypatch.setenv("FACEAPP_JOBS_DB_FILE", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setenv("FACEAPP_SESSION_LOG_FILE", str(tmp_path / "session_log.jsonl"))
+    return create_app(load_config())
@@ -0,0 +1,121 @@
+import pickle
+import threading
+
+import numpy as np
+import pytest
+
+from server.gallery import (
+    Gallery,
+    GalleryMismatchError,
+    PickleGallery,
+    read_gallery_file,
+    write_gallery_file,
+)
+from server.metrics import get_metric
+
+COSINE = get_metric("cosine")
+
+
+def random_embeddings(count, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    return {f"S{i}": rng.normal(size=dim).tolist() for i in range(count)}
+
+
+def test_round_trip_keeps_model_and_dim(tmp_path):
+    path = tmp_path / "db.pkl"
+    embeddings = random_embeddings(3, 512)
+    write_gallery_file(path, "ArcFace", embeddings)
+
+    model_name, dim, loaded = read_gallery_file(path)
+    assert model_name == "ArcFace"
+    assert dim == 512
+    assert loaded.keys() == embeddings.keys()
+
+    gallery = PickleGallery(str(path), "ArcFace", COSINE)
+    assert len(gallery) == 3
+    assert gallery.metadata() == {"model_name": "ArcFace", "dim": 512, "count": 3}
+
+
+def test_legacy_file_is_upgraded_on_save(tmp_path):
+    path = tmp_path / "db.pkl"
+    with open(path, "wb") as f:
+        pickle.dump(random_embeddings(2, 512), f)
+    assert read_gallery_file(path)[:2] == (None, None)
+
+    gallery = PickleGallery(str(path), "ArcFace", COSINE)
+    gallery.add("NEW", np.ones(512))
+    gallery.save()
+
+    model_name, dim, loaded = read_gallery_file(path)
+    assert (model_name, dim) == ("ArcFace", 512)
+    assert set(loaded) == {"S0", "S1", "NEW"}
+
+
+def test_model_mismatch_is_rejected(tmp_path):
+    path = tmp_path / "db.pkl"
+    write_gallery_file(path, "ArcFace", random_embeddings(2, 512))
+    with pytest.raises(GalleryMismatchError):
+        PickleGallery(str(path), "Facenet", COSINE)
+
+
+def test_legacy_file_with_wrong_dimension_is_rejected(tmp_path):
+    path = tmp_path / "db.pkl"
+    with open(path, "wb") as f:
+        pickle.dump(random_embeddings(2, 512), f)
+    with pytest.raises(GalleryMismatchError):
+        PickleGallery(str(path), "Facenet", COSINE)
+
+
+def test_stored_dim_is_enforced_for_unknown_models(tmp_path):
+    path = tmp_path / "db.pkl"
+    write_gallery_file(path, "Custom", {}, dim=64)
+    gallery = PickleGallery(str(path), "Custom", COSINE)
+    assert gallery.dim == 64
+    with pytest.raises(GalleryMismatchError):
+        gallery.add("S0", np.ones(32))
+
+
+def test_mixed_dimensions_cannot_be_written(tmp_path):
+    with pytest.raises(GalleryMismatchError):
+        write_gallery_file(tmp_path / "db.pkl", "ArcFace", {"A": [0.0] * 512, "B": [0.0] * 128})
+
+
+def test_find_best_match_and_subset():
+    embeddings = random_embeddings(50, 128)
+    gallery = Gallery("Facenet", COSINE, embeddings)
+
+    assert gallery.find_best_match(np.array(embeddings["S7"]))[0] == "S7"
+    with pytest.raises(GalleryMismatchError):
+        gallery.find_best_match(np.ones(512))
+
+    present, matrix = gallery.subset(["S3", "missing", "S9"])
+    assert present == ["S3", "S9"]
+    assert matrix.shape == (2, 128) and matrix.flags["C_CONTIGUOUS"]
+
+
+def test_empty_gallery_has_no_match():
+    assert Gallery("ArcFace", COSINE).find_best_match(np.ones(512)) == (None, None)
+
+
+def test_matching_is_not_blocked_while_saving(tmp_path, monkeypatch):
+    gallery = PickleGallery(str(tmp_path / "db.pkl"), "Facenet", COSINE)
+    gallery.add("S1", np.ones(128))
+    writing, release, written = threading.Event(), threading.Event(), threading.Event()
+
+    def slow_write(*args):
+        writing.set()
+        release.wait(2)
+        written.set()
+
+    monkeypatch.setattr("server.gallery.write_gallery_file", slow_write)
+    saver = threading.Thread(target=gallery.save)
+    saver.start()
+    assert writing.wait(5)
+    try:
+        assert gallery.find_best_match(np.ones(128))[0] == "S1"
+        gallery.add("S2", np.full(128, 0.5))
+        # Both calls returned while the write was still in progress
+        assert not written.is_set()
+    finally:
+        release.set()
+        saver.join()
@@ -0,0 +1,107 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from server.jobs import FAILED, QUEUE_SIZE, QUEUED, SUCCEEDED, JobManager, JobStore, QueueFullError
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+def test_job_runs_and_reports_progress(store):
+    manager = JobManager(store, num_workers=1)
+
+    def handler(payload, report_progress):
+        for i, _ in enumerate(payload):
+            report_progress(i + 1)
+        return {"count": len(payload)}
+
+    manager.register("count", handler)
+    manager.start()
+    job_id = manager.submit("count", [1, 2, 3], total=3)
+    job = manager.wait(job_id, timeout=5)
+    manager.stop()
+
+    assert job["status"] == SUCCEEDED
+    assert job["progress"] == {"done": 3, "total": 3}
+    assert job["result"] == {"count": 3}
+
+
+def test_full_queue_rejects_without_saving_and_stop_cancels_backlog(store):
+    release = threading.Event()
+    started = threading.Event()
+    manager = JobManager(store, maxsize=1, num_workers=1)
+    manager.register("block", lambda payload, report_progress: (started.set(), release.wait()))
+    manager.start()
+
+    running = manager.submit("block", None, total=1)
+    started.wait(5)
+    queued = manager.submit("block", None, total=1)
+    with pytest.raises(QueueFullError):
+        manager.submit("block", None, total=1)
+    assert store._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 2
+
+    threading.Timer(0.1, release.set).start()
+    manager.stop()
+    assert manager.get(running)["status"] == SUCCEEDED
+    assert manager.get(queued)["status"] == FAILED
+
+
+def test_unfinished_jobs_fail_on_restart(store):
+    store.create("stale", "count", 1)
+    JobManager(store, num_workers=0).start()
+    assert store.get("stale")["status"] == FAILED
+
+
+def submit_batch(client, size=1):
+    return client.post(
+        "/jobs/verify-batch",
+        data={"registerNumbers": [f"S{i}" for i in range(size)]},
+        files=[("files", (f"S{i}.jpg", b"image", "image/jpeg")) for i in range(size)],
+    )
+
+
+def test_job_endpoints_accept_and_hide_result_until_asked(app):
+    # Without the context manager startup is skipped, so no workers drain the queue
+    client = TestClient(app)
+    response = submit_batch(client, size=2)
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    job = client.get(f"/jobs/{job_id}").json()
+    assert job["status"] == QUEUED and job["progress"] == {"done": 0, "total": 2}
+    assert "result" not in job
+    assert client.get(f"/jobs/{job_id}/result").json()["result"] is None
+    assert client.get("/jobs/missing").status_code == 404
+
+
+def test_job_submit_returns_503_when_queue_is_full(app):
+    client = TestClient(app)
+    for _ in range(QUEUE_SIZE):
+        assert submit_batch(client).status_code == 202
+    assert submit_batch(client).status_code == 503
+
+
+def test_job_result_long_polls_until_finished(app):
+    app.state.job_manager.register("verify-batch", lambda payload, report_progress: {"count": len(payload)})
+    with TestClient(app) as client:
+        job_id = submit_batch(client, size=3).json()["job_id"]
+        job = client.get(f"/jobs/{job_id}/result", params={"wait": 5}).json()
+    assert job["status"] == SUCCEEDED
+    assert job["result"] == {"count": 3}
+
+
+@pytest.mark.parametrize("wait", ["nan", "inf", "-1", "61"])
+def test_job_result_rejects_invalid_wait(app, wait):
+    client = TestClient(app)
+    job_id = submit_batch(client).json()["job_id"]
+    assert client.get(f"/jobs/{job_id}/result", params={"wait": wait}).status_code == 422
+
+
+def test_wait_rejects_non_finite_timeout(store):
+    manager = JobManager(store, num_workers=0)
+    with pytest.raises(ValueError):
+        manager.wait("missing", float("nan"))
@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+import httpx
+import numpy as np
+import pytest
+
+from server.loadgen import Stats, arrival_times, load_records, send, wait_until_ready
+
+
+def test_arrival_times_are_sorted_and_include_bursts():
+    rng = np.random.default_rng(0)
+    times = arrival_times(rate=0, duration=30, burst_every=10, burst_size=5, burst_spread=2, rng=rng)
+    assert len(times) == 15
+    assert times == sorted(times)
+    assert all(start <= t < start + 2 for start, t in zip(np.repeat([0, 10, 20], 5), times))
+
+    times = arrival_times(rate=50, duration=10, burst_every=0, burst_size=0, burst_spread=0, rng=rng)
+    assert 400 < len(times) < 600
+    assert all(0 < t < 10 for t in times)
+
+
+def test_load_records_skips_non_api_lines(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    lines = [
+        {"endpoint": "verify-attendance", "registerNumber": "S1", "image": "s1.png"},
+        {"endpoint": "health"},
+        {"endpoint": "register-student", "registerNumber": "", "image": "s2.png"},
+        {"endpoint": "register-student", "registerNumber": "S2", "image": "s2.png"},
+    ]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n\n")
+    assert load_records(path) == [lines[0], lines[3]]
+
+
+def test_stats_summary_counts_rejections_apart_from_errors():
+    stats = Stats()
+    for latency, outcome in [(0.1, "ok"), (0.2, "rejected"), (0.3, "http_500"), (0.4, "ReadTimeout")]:
+        stats.add(latency, outcome)
+    summary = stats.summary()
+    assert summary["completed"] == 4
+    assert summary["errors"] == 2 and summary["error_rate"] == 0.5
+    assert summary["p50_ms"] == pytest.approx(250)
+    assert summary["outcomes"] == {"ok": 1, "rejected": 1, "http_500": 1, "ReadTimeout": 1}
+    assert Stats().summary()["p99_ms"] == 0.0
+
+
+def test_send_records_unparseable_responses():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=b"not json"))
+    record = {"endpoint": "verify-attendance", "registerNumber": "S1", "image": "s1.png"}
+    outcomes = []
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            scheduled = asyncio.get_running_loop().time()
+            await send(client, record, {"s1.png": b"image"}, 5, scheduled, lambda latency, outcome: outcomes.append(outcome))
+
+    asyncio.run(run())
+    assert outcomes == ["JSONDecodeError"]
+
+
+class RunningProcess:
+    def poll(self):
+        return None
+
+
+def test_wait_until_ready_raises_when_degraded():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"status": "degraded"}))
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await wait_until_ready(client, RunningProcess(), timeout=5)
+
+    with pytest.raises(RuntimeError, match="degraded"):
+        asyncio.run(run())
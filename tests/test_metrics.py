@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from server.metrics import get_metric
+
+
+def test_cosine_prefers_highest_similarity():
+    metric = get_metric("cosine")
+    prepared = metric.prepare(np.array([[1.0, 0.0], [0.0, 2.0]]))
+    index, score = metric.best(prepared, np.array([0.1, 3.0]))
+    assert index == 1
+    assert metric.accepts(score, 0.9)
+    assert 0.0 <= metric.confidence(score) <= 1.0
+
+
+def test_euclidean_prefers_smallest_distance():
+    metric = get_metric("euclidean")
+    prepared = metric.prepare(np.array([[0.0, 0.0], [5.0, 5.0]]))
+    index, score = metric.best(prepared, np.array([4.0, 5.0]))
+    assert (index, score) == (1, pytest.approx(1.0))
+    assert metric.accepts(score, 10) and not metric.accepts(score, 0.5)
+    assert metric.confidence(score) == pytest.approx(0.5)
+
+
+def test_unknown_metric():
+    with pytest.raises(ValueError):
+        get_metric("manhattan")
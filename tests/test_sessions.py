@@ -0,0 +1,108 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from server.app import parse_time
+from server.gallery import Gallery
+from server.metrics import get_metric
+from server.sessions import SessionManager
+
+
+def make_gallery():
+    rng = np.random.default_rng(0)
+    return Gallery("Facenet", get_metric("cosine"), {f"S{i}": rng.normal(size=128).tolist() for i in range(20)})
+
+
+def test_session_matches_against_roster_only():
+    gallery = make_gallery()
+    manager = SessionManager()
+    session = manager.open(["S1", "S2", "NOT_ENROLLED"], gallery)
+
+    assert session.candidates == ["S1", "S2"]
+    assert session.has_candidate("S1") and not session.has_candidate("S5")
+    query = np.array(gallery._embeddings["S2"])
+    assert session.find_best_match(query)[0] == "S2"
+
+
+def test_record_keeps_best_result_for_roster_students():
+    session = SessionManager().open(["S1"], make_gallery())
+    session.record("S1", "ABSENT", 0.2, "t1")
+    session.record("S1", "PRESENT", 0.6, "t2")
+    session.record("S1", "ABSENT", 0.9, "t3")
+    session.record("S9", "PRESENT", 1.0, "t4")
+
+    summary = session.summary()
+    assert summary["present"] == ["S1"]
+    assert list(summary["results"]) == ["S1"]
+    assert summary["results"]["S1"]["timestamp"] == "t2"
+
+
+def test_refresh_picks_up_reenrollment():
+    gallery = make_gallery()
+    manager = SessionManager()
+    session = manager.open(["S1", "NEW"], gallery)
+    assert session.candidates == ["S1"]
+
+    gallery.add("NEW", np.ones(128))
+    manager.refresh("NEW", gallery)
+    assert session.candidates == ["S1", "NEW"]
+    assert session.find_best_match(np.ones(128))[0] == "NEW"
+
+
+def test_expired_sessions_are_flushed(tmp_path):
+    log_file = tmp_path / "sessions.jsonl"
+    manager = SessionManager(str(log_file))
+    now = datetime.now()
+    session = manager.open(["S1"], make_gallery(), now - timedelta(hours=2), now - timedelta(hours=1))
+
+    assert manager.get(session.session_id) is None
+    [line] = log_file.read_text().splitlines()
+    assert json.loads(line)["session_id"] == session.session_id
+
+
+def test_parse_time_converts_utc_to_local():
+    expected = datetime(2024, 1, 1, 12, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    assert parse_time("2024-01-01T12:00:00Z", "startsAt") == expected
+    assert parse_time("2024-01-01T12:00:00", "startsAt") == datetime(2024, 1, 1, 12)
+    assert parse_time(None, "startsAt") is None
+
+
+def test_session_endpoints(app):
+    client = TestClient(app)
+    now = datetime.now(timezone.utc)
+    response = client.post("/sessions", data={
+        "roster": ["S1", "S2"],
+        "startsAt": now.isoformat().replace("+00:00", "Z"),
+        "endsAt": (now + timedelta(hours=1)).isoformat().replace("+00:00", "Z"),
+    })
+    assert response.status_code == 200
+    session = response.json()
+    assert session["roster_size"] == 2 and session["not_registered"] == ["S1", "S2"]
+    assert client.get(f"/sessions/{session['session_id']}").json()["session_id"] == session["session_id"]
+
+    assert client.post("/sessions", data={"roster": ["S1"], "startsAt": "nonsense"}).status_code == 400
+    response = client.post("/sessions", data={
+        "roster": ["S1"], "startsAt": "2024-01-01T12:00:00", "endsAt": "2024-01-01T12:00:00"
+    })
+    assert response.status_code == 400
+
+
+def test_unknown_and_expired_sessions_return_404(app):
+    client = TestClient(app)
+    now = datetime.now()
+    expired = client.post("/sessions", data={
+        "roster": ["S1"],
+        "startsAt": (now - timedelta(hours=2)).isoformat(),
+        "endsAt": (now - timedelta(hours=1)).isoformat(),
+    }).json()["session_id"]
+
+    for session_id in ("missing", expired):
+        assert client.get(f"/sessions/{session_id}").status_code == 404
+        response = client.post(
+            "/verify-attendance",
+            data={"registerNumber": "S1", "sessionId": session_id},
+            files={"file": ("S1.jpg", b"image", "image/jpeg")},
+        )
+        assert response.status_code == 404
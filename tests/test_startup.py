@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import types
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from server.embedding import Embedder
+from server.importtime import LINE_RE
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["deepface", "tensorflow", "PIL", "uvicorn", "googleapiclient"]
+
+
+def test_importing_backend_skips_heavy_dependencies(tmp_path):
+    env = dict(
+        os.environ,
+        FACEAPP_JOBS_DB_FILE=str(tmp_path / "jobs.sqlite3"),
+        FACEAPP_SESSION_LOG_FILE=str(tmp_path / "session_log.jsonl"),
+    )
+    code = f"import sys, backend; print([name for name in {HEAVY_MODULES!r} if name in sys.modules])"
+    proc = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.splitlines()[-1] == "[]"
+
+
+def test_health_reports_warming_then_degraded(app):
+    service = app.state.service
+    loading, fail = threading.Event(), threading.Event()
+
+    def warm_up():
+        loading.set()
+        fail.wait(5)
+        raise RuntimeError("no weights")
+
+    service.embedder.warm_up = warm_up
+    app.state.config.warm_up = True
+    with TestClient(app) as client:
+        assert loading.wait(5)
+        assert client.get("/health").json()["status"] == "warming"
+        fail.set()
+        deadline = time.monotonic() + 5
+        while service.model_state == "warming" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        health = client.get("/health").json()
+    assert health["status"] == "degraded"
+    assert health["model_state"] == "failed"
+
+
+def test_importtime_line_re():
+    match = LINE_RE.match("import time:       812 |      45210 |     deepface.commons.functions")
+    assert match.groups() == ("812", "45210", "deepface.commons.functions")
+    assert LINE_RE.match("import time: self [us] | cumulative | imported package") is None
+
+
+def test_embedder_loads_once_and_bounds_concurrency(monkeypatch):
+    lock = threading.Lock()
+    calls = {"build": 0, "active": 0, "peak": 0}
+
+    def build_model(model_name):
+        with lock:
+            calls["build"] += 1
+        time.sleep(0.05)
+
+    def represent(image, **kwargs):
+        with lock:
+            calls["active"] += 1
+            calls["peak"] = max(calls["peak"], calls["active"])
+        time.sleep(0.02)
+        with lock:
+            calls["active"] -= 1
+        return [{"embedding": [1.0, 0.0]}]
+
+    deepface = types.ModuleType("deepface")
+    deepface.DeepFace = types.SimpleNamespace(build_model=build_model, represent=represent)
+    monkeypatch.setitem(sys.modules, "deepface", deepface)
+
+    embedder = Embedder("ArcFace", "mtcnn", max_concurrency=2)
+    threads = [threading.Thread(target=embedder.represent, args=(np.zeros((8, 8, 3)),)) for _ in range(8)]
+    threads.append(threading.Thread(target=embedder.warm_up))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls["build"] == 1
+    assert calls["peak"] <= 2